@@ -6,19 +6,88 @@ Provides an interactive web interface using Dash by Plotly.
 import logging
 import pandas as pd
 import dash
-from dash import dcc, html, Input, Output, dash_table
-import plotly.express as px
+from dash import dcc, html, Input, Output, Patch, dash_table
+from flask_caching import Cache
 import plotly.graph_objects as go
 from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import hashlib
+import json
+import os
+import tempfile
+import time
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 logger = logging.getLogger(__name__)
 
 # Initialize the Dash app
 app = dash.Dash(__name__, suppress_callback_exceptions=True)
 
+# Filesystem cache for the filtered tweet data shared by all dashboard components
+DATA_CACHE_TTL = 300
+cache = Cache(app.server, config={
+    'CACHE_TYPE': 'FileSystemCache',
+    'CACHE_DIR': '.cache/dashboard',
+    'CACHE_DEFAULT_TIMEOUT': DATA_CACHE_TTL
+})
+
+# Parsed tweet DataFrames are kept on disk as Parquet, keyed by filter parameters,
+# so chart callbacks read only the columns they need instead of shipping tweets
+# through the browser
+TWEETS_CACHE_DIR = Path('.cache/tweets')
+# A file is reused for up to DATA_CACHE_TTL after it was written and kept a
+# while longer, so keys held by memoized results still resolve
+TWEETS_CACHE_MAX_AGE = 2 * DATA_CACHE_TTL
+
+# Text columns kept in the cached frame besides created_at and coins_mentioned
+TWEET_TEXT_COLUMNS = ['username', 'text', 'sentiment']
+
 # Global variables for API configuration
 API_BASE_URL = None
+API_TIMEOUT = 5
+
+# Shared HTTP session so API calls reuse pooled keep-alive connections
+_session = requests.Session()
+_session.mount('http://', HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=20,
+    max_retries=Retry(total=2, backoff_factor=0.1)
+))
+
+# Worker pool for issuing independent API requests concurrently
+_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='dashboard-api')
+
+# Whether the API serves /api/tweet_stats; None until the first response tells us
+_tweet_stats_available = None
+
+# Lookup endpoints (celebrities, keywords) rarely change, so cache them briefly
+LOOKUP_CACHE_TTL = 300
+_lookup_cache = {}
+
+# Chart titles and colors
+ACTIVITY_TITLE = 'Tweet Activity Over Time'
+TRENDING_TITLE = 'Trending Memecoins by Mention Count'
+SENTIMENT_TITLE = 'Tweet Sentiment Distribution'
+SENTIMENT_COLORS = {
+    'positive': '#2ecc71',
+    'neutral': '#95a5a6',
+    'negative': '#e74c3c'
+}
+SENTIMENT_LABELS = list(SENTIMENT_COLORS)
+CHART_LAYOUT = dict(
+    template='plotly_white',
+    plot_bgcolor='white',
+    paper_bgcolor='white',
+    font=dict(color='#2c3e50'),
+    title_font=dict(size=20),
+    margin=dict(t=40, l=40, r=40, b=40),
+    # Keep zoom, pan and legend selections across data updates
+    uirevision='constant'
+)
 
 def create_layout():
     """Create the layout for the dashboard."""
@@ -77,11 +146,15 @@ def create_layout():
             
             # Main Content Area
             html.Div([
+                # Tweet statistics (or the cache key of the filtered tweets) and
+                # the trends shared by the charts and table
+                dcc.Store(id='tweets-store'),
+                
                 # Top Row - Tweet Activity
                 html.Div([
                     html.Div([
                         html.H3("Tweet Activity Over Time"),
-                        dcc.Graph(id='tweet-activity-chart')
+                        dcc.Graph(id='tweet-activity-chart', figure=build_activity_figure())
                     ], className="chart-container")
                 ], className="top-row"),
                 
@@ -89,12 +162,12 @@ def create_layout():
                 html.Div([
                     html.Div([
                         html.H3("Trending Memecoins"),
-                        dcc.Graph(id='trending-coins-chart')
+                        dcc.Graph(id='trending-coins-chart', figure=build_trending_figure())
                     ], className="chart-container"),
                     
                     html.Div([
                         html.H3("Sentiment Analysis"),
-                        dcc.Graph(id='sentiment-chart')
+                        dcc.Graph(id='sentiment-chart', figure=build_sentiment_figure())
                     ], className="chart-container")
                 ], className="middle-row"),
                 
@@ -151,13 +224,288 @@ def create_layout():
 def fetch_from_api(endpoint, params=None):
     """Helper function to fetch data from the API."""
     try:
-        response = requests.get(f"{API_BASE_URL}{endpoint}", params=params)
+        response = _session.get(f"{API_BASE_URL}{endpoint}", params=params, timeout=API_TIMEOUT)
         response.raise_for_status()
-        return response.json()
+        return orjson.loads(response.content)
     except Exception as e:
         logger.error(f"Error fetching from API {endpoint}: {e}")
         return None
 
+def fetch_tweet_stats(params):
+    """
+    Fetch pre-aggregated tweet statistics from /api/tweet_stats.
+    
+    A 404 is remembered so later loads go straight to /api/tweets instead
+    of requesting the missing endpoint again.
+    """
+    global _tweet_stats_available
+    try:
+        response = _session.get(f"{API_BASE_URL}/api/tweet_stats", params=params, timeout=API_TIMEOUT)
+        if response.status_code == 404:
+            logger.info("API does not provide /api/tweet_stats; aggregating raw tweets instead")
+            _tweet_stats_available = False
+            return None
+        response.raise_for_status()
+        _tweet_stats_available = True
+        return orjson.loads(response.content)
+    except Exception as e:
+        logger.error(f"Error fetching from API /api/tweet_stats: {e}")
+        return None
+
+def fetch_cached_from_api(endpoint):
+    """Fetch data from the API, reusing responses younger than LOOKUP_CACHE_TTL."""
+    cached = _lookup_cache.get(endpoint)
+    if cached and time.monotonic() - cached[0] < LOOKUP_CACHE_TTL:
+        return cached[1]
+    
+    data = fetch_from_api(endpoint)
+    if data is not None:
+        _lookup_cache[endpoint] = (time.monotonic(), data)
+    return data
+
+def build_activity_figure():
+    """Build the empty tweet activity line chart that callbacks patch in place."""
+    # WebGL trace keeps rendering and zoom/pan fast for long activity series
+    fig = go.Figure(go.Scattergl(
+        x=[],
+        y=[],
+        mode='lines+markers',
+        line=dict(color='#3498db', width=3),
+        marker=dict(size=8)
+    ))
+    fig.update_layout(
+        title=ACTIVITY_TITLE,
+        xaxis_title='Date',
+        yaxis_title='Number of Tweets',
+        **CHART_LAYOUT
+    )
+    return fig
+
+def build_trending_figure():
+    """Build the empty trending coins bar chart that callbacks patch in place."""
+    fig = go.Figure(go.Bar(
+        x=[],
+        y=[],
+        marker=dict(color='#3498db', line=dict(color='#2980b9', width=1.5)),
+        opacity=0.8
+    ))
+    fig.update_layout(
+        title=TRENDING_TITLE,
+        xaxis_title='Memecoin',
+        yaxis_title='Number of Mentions',
+        **CHART_LAYOUT
+    )
+    return fig
+
+def build_sentiment_figure():
+    """Build the empty sentiment pie chart that callbacks patch in place."""
+    # Labels and colors are fixed up front; callbacks only patch the values
+    fig = go.Figure(go.Pie(
+        labels=SENTIMENT_LABELS,
+        values=[],
+        sort=False,
+        marker=dict(colors=[SENTIMENT_COLORS[label] for label in SENTIMENT_LABELS])
+    ))
+    fig.update_layout(
+        title=SENTIMENT_TITLE,
+        showlegend=True,
+        legend=dict(
+            orientation="h",
+            yanchor="bottom",
+            y=1.02,
+            xanchor="right",
+            x=1
+        ),
+        **CHART_LAYOUT
+    )
+    return fig
+
+def activity_trace_data(tweet_counts):
+    """Return the line trace fields for per-day tweet counts."""
+    return {'x': tweet_counts['date'].tolist(), 'y': tweet_counts['count'].tolist()}
+
+def trending_trace_data(trends):
+    """Return the bar trace fields for per-coin mention counts."""
+    return {'x': trends['coin'].tolist(), 'y': trends['mention_count'].tolist()}
+
+def sentiment_trace_data(sentiment_counts):
+    """Return the pie trace fields for tweet counts indexed by sentiment."""
+    return {'values': sentiment_counts.reindex(SENTIMENT_LABELS, fill_value=0).tolist()}
+
+def patch_figure(title, trace_data):
+    """Build a Patch that replaces the title and first trace data of a figure."""
+    patch = Patch()
+    patch['layout']['title']['text'] = title
+    for key, value in trace_data.items():
+        patch['data'][0][key] = value
+    return patch
+
+def tweets_cache_key(params):
+    """Return the cache key for tweets fetched with the given filter parameters."""
+    return hashlib.sha1(json.dumps(params, sort_keys=True).encode()).hexdigest()
+
+def tweets_cache_path(key):
+    """Return the Parquet file holding the tweets for a cache key."""
+    return TWEETS_CACHE_DIR / f"{key}.parquet"
+
+def fresh_tweets_key(params):
+    """Return the cache key for `params` if its file was written within DATA_CACHE_TTL, else None."""
+    key = tweets_cache_key(params)
+    try:
+        if time.time() - tweets_cache_path(key).stat().st_mtime <= DATA_CACHE_TTL:
+            return key
+    except FileNotFoundError:
+        pass
+    return None
+
+def parse_created_at(created_at):
+    """
+    Parse tweet timestamps sent by the API.
+    
+    Epoch milliseconds take the fast integer conversion path; ISO strings
+    are still accepted.
+    """
+    if pd.api.types.is_numeric_dtype(created_at):
+        return pd.to_datetime(created_at, unit='ms', utc=True)
+    return pd.to_datetime(created_at, utc=True, errors='coerce')
+
+def format_coins(coins):
+    """Format a tweet's coin list (or comma-separated string) for display."""
+    if isinstance(coins, (list, tuple)):
+        return ', '.join(str(coin) for coin in coins)
+    if isinstance(coins, str):
+        return coins
+    return ''
+
+def tweets_frame(tweets):
+    """
+    Build the narrow frame of tweet fields used by the charts and table.
+    
+    API payloads vary in shape (mixed list/string coin columns, nested
+    dicts, mixed id types), so only the needed columns are kept, each with
+    an explicit dtype that Parquet can store.
+    """
+    df = pd.DataFrame(tweets)
+    frame = pd.DataFrame({'created_at': parse_created_at(df['created_at'])})
+    for column in TWEET_TEXT_COLUMNS:
+        if column in df:
+            frame[column] = df[column].astype('string')
+        else:
+            frame[column] = pd.Series(pd.NA, index=df.index, dtype='string')
+    
+    coins = df['coins_mentioned'] if 'coins_mentioned' in df else pd.Series(None, index=df.index, dtype=object)
+    frame['coins_mentioned'] = coins.map(format_coins).astype('string')
+    return frame
+
+def store_tweets_frame(tweets, params):
+    """
+    Parse fetched tweets into a DataFrame and cache it on disk.
+    
+    Args:
+        tweets (list): Tweet dictionaries returned by the API
+        params (dict): Filter parameters the tweets were fetched with
+        
+    Returns:
+        str: Cache key of the stored DataFrame
+    """
+    key = tweets_cache_key(params)
+    TWEETS_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    
+    df = tweets_frame(tweets)
+    
+    # Write to a temporary file first so readers never see a partial file
+    path = tweets_cache_path(key)
+    with tempfile.NamedTemporaryFile(dir=TWEETS_CACHE_DIR, suffix='.tmp', delete=False) as tmp_file:
+        df.to_parquet(tmp_file, index=False)
+    os.replace(tmp_file.name, path)
+    
+    # Drop files for filter combinations nobody has requested in a while
+    now = time.time()
+    for old_path in TWEETS_CACHE_DIR.glob('*.parquet'):
+        try:
+            if now - old_path.stat().st_mtime > TWEETS_CACHE_MAX_AGE:
+                old_path.unlink()
+        except FileNotFoundError:
+            pass
+    
+    return key
+
+def read_tweets_frame(key, columns=None):
+    """
+    Read cached tweets, optionally limited to some columns.
+    
+    Args:
+        key (str): Cache key returned by store_tweets_frame, or None
+        columns (list, optional): Columns to read
+        
+    Returns:
+        pd.DataFrame: Cached tweets, empty when there is no key
+    """
+    if not key:
+        return pd.DataFrame(columns=columns)
+    return pd.read_parquet(tweets_cache_path(key), columns=columns)
+
+def empty_dashboard_data(message):
+    """Return dashboard data with nothing loaded and `message` as chart title."""
+    return {'stats': None, 'tweets_key': None, 'trends': [], 'message': message, 'trends_message': None}
+
+@cache.memoize(response_filter=lambda data: data['message'] is None and data['trends_message'] is None)
+def load_dashboard_data(start_date, end_date, celebrities, keywords):
+    """
+    Fetch the filtered tweet statistics and trends shown on the dashboard.
+    
+    Pre-aggregated statistics from /api/tweet_stats are used as is. When the
+    API does not provide them, raw tweets fetched alongside are parsed once
+    and cached on disk, and the returned dictionary only carries their cache
+    key; a file written within DATA_CACHE_TTL is reused without fetching the
+    tweets again. Results are memoized per filter combination; failed or
+    empty loads are not cached.
+    """
+    params = {
+        'start_date': start_date,
+        'end_date': end_date
+    }
+    if celebrities:
+        params['celebrities'] = list(celebrities)
+    if keywords:
+        params['keywords'] = list(keywords)
+    
+    cached_tweets_key = fresh_tweets_key(params)
+    
+    # Requests are independent, so issue them concurrently. Raw tweets are
+    # only needed until the API is known to serve statistics and when no
+    # fresh file is cached, and statistics are not requested again once the
+    # API has answered 404.
+    trends_future = _executor.submit(fetch_from_api, '/api/trends', params)
+    stats_future = None
+    tweets_future = None
+    if _tweet_stats_available is not False:
+        stats_future = _executor.submit(fetch_tweet_stats, params)
+    if _tweet_stats_available is not True and not cached_tweets_key:
+        tweets_future = _executor.submit(fetch_from_api, '/api/tweets', params)
+    
+    stats = stats_future.result() if stats_future else None
+    trends = trends_future.result()
+    
+    tweets_key = None
+    if stats is None and cached_tweets_key:
+        tweets_key = cached_tweets_key
+    elif stats is None:
+        # Fall back to aggregating raw tweets locally
+        tweets = tweets_future.result() if tweets_future else fetch_from_api('/api/tweets', params)
+        if tweets:
+            tweets_key = store_tweets_frame(tweets, params)
+    
+    if not tweets_key and not (stats and stats.get('by_day')):
+        return empty_dashboard_data("No data available for the selected filters")
+    
+    data = {'stats': stats, 'tweets_key': tweets_key, 'trends': trends, 'message': None, 'trends_message': None}
+    if trends is None:
+        # Only the trending chart is affected
+        data.update(trends=[], trends_message="Error loading trend data")
+    
+    return data
+
 # Initialize callbacks
 def init_callbacks(app):
     """Initialize all the callbacks for the dashboard."""
@@ -170,10 +518,10 @@ def init_callbacks(app):
     def populate_dropdowns(start_date):
         """Populate the dropdown options with data from the API."""
         try:
-            celebrities = fetch_from_api('/api/celebrities')
+            celebrities = fetch_cached_from_api('/api/celebrities')
             celebrity_options = [{"label": celeb["name"], "value": celeb["username"]} for celeb in celebrities]
             
-            keywords = fetch_from_api('/api/keywords')
+            keywords = fetch_cached_from_api('/api/keywords')
             keyword_options = [{"label": kw, "value": kw} for kw in keywords]
             
             return celebrity_options, keyword_options
@@ -182,128 +530,128 @@ def init_callbacks(app):
             return [], []
     
     @app.callback(
-        [Output('tweet-activity-chart', 'figure'),
-         Output('trending-coins-chart', 'figure'),
-         Output('sentiment-chart', 'figure'),
-         Output('tweet-table', 'data')],
+        Output('tweets-store', 'data'),
         [Input('apply-filters', 'n_clicks')],
         [dash.dependencies.State('date-range', 'start_date'),
          dash.dependencies.State('date-range', 'end_date'),
          dash.dependencies.State('celebrity-dropdown', 'value'),
          dash.dependencies.State('keyword-dropdown', 'value')]
     )
-    def update_dashboard(n_clicks, start_date, end_date, celebrities, keywords):
-        """Update all dashboard components based on the selected filters."""
+    def load_tweets(n_clicks, start_date, end_date, celebrities, keywords):
+        """Load the filtered data shared by all dashboard components."""
         try:
-            # Get filtered data from API
-            params = {
-                'start_date': start_date,
-                'end_date': end_date
-            }
-            if celebrities:
-                params['celebrities'] = celebrities
-            if keywords:
-                params['keywords'] = keywords
-                
-            tweets = fetch_from_api('/api/tweets', params)
-            if not tweets:
-                empty_fig = px.line(title="No data available for the selected filters")
-                empty_table = []
-                return empty_fig, empty_fig, empty_fig, empty_table
-            
-            # Convert to DataFrame for easier manipulation
-            df = pd.DataFrame(tweets)
-            
-            # Process data for charts
-            df['created_at'] = pd.to_datetime(df['created_at'])
-            df['date'] = df['created_at'].dt.date
-            
-            # Tweet Activity Chart
-            tweet_counts = df.groupby('date').size().reset_index(name='count')
-            activity_fig = px.line(
-                tweet_counts, 
-                x='date', 
-                y='count', 
-                title='Tweet Activity Over Time',
-                labels={'date': 'Date', 'count': 'Number of Tweets'},
-                template='plotly_white'
-            )
-            activity_fig.update_layout(
-                plot_bgcolor='white',
-                paper_bgcolor='white',
-                font=dict(color='#2c3e50'),
-                title_font=dict(size=20),
-                margin=dict(t=40, l=40, r=40, b=40)
-            )
-            activity_fig.update_traces(
-                line=dict(color='#3498db', width=3),
-                marker=dict(size=8)
-            )
-            
-            # Trending Coins Chart
-            trends = fetch_from_api('/api/trends', params)
-            trending_fig = px.bar(
-                trends,
-                x='coin',
-                y='mention_count',
-                title='Trending Memecoins by Mention Count',
-                labels={'coin': 'Memecoin', 'mention_count': 'Number of Mentions'},
-                template='plotly_white'
-            )
-            trending_fig.update_layout(
-                plot_bgcolor='white',
-                paper_bgcolor='white',
-                font=dict(color='#2c3e50'),
-                title_font=dict(size=20),
-                margin=dict(t=40, l=40, r=40, b=40)
-            )
-            trending_fig.update_traces(
-                marker_color='#3498db',
-                marker_line_color='#2980b9',
-                marker_line_width=1.5,
-                opacity=0.8
+            return load_dashboard_data(
+                start_date,
+                end_date,
+                tuple(celebrities or ()),
+                tuple(keywords or ())
             )
+        except Exception as e:
+            logger.error(f"Error in load_tweets: {e}")
+            return empty_dashboard_data(f"Error loading data: {str(e)}")
+    
+    @app.callback(
+        Output('tweet-activity-chart', 'figure'),
+        [Input('tweets-store', 'data')],
+        prevent_initial_call=True
+    )
+    def update_activity_chart(data):
+        """
+        Update the tweet activity chart from the loaded tweets.
+        
+        Chart callbacks only patch trace data and the title of the figures
+        created with the layout, so Plotly.js can diff them in place.
+        """
+        try:
+            title = data['message'] or ACTIVITY_TITLE
             
-            # Sentiment Analysis Chart
-            sentiment_data = df.groupby('sentiment').size().reset_index(name='count')
-            sentiment_fig = px.pie(
-                sentiment_data,
-                values='count',
-                names='sentiment',
-                title='Tweet Sentiment Distribution',
-                color='sentiment',
-                color_discrete_map={
-                    'positive': '#2ecc71',
-                    'neutral': '#95a5a6',
-                    'negative': '#e74c3c'
-                },
-                template='plotly_white'
-            )
-            sentiment_fig.update_layout(
-                plot_bgcolor='white',
-                paper_bgcolor='white',
-                font=dict(color='#2c3e50'),
-                title_font=dict(size=20),
-                margin=dict(t=40, l=40, r=40, b=40),
-                showlegend=True,
-                legend=dict(
-                    orientation="h",
-                    yanchor="bottom",
-                    y=1.02,
-                    xanchor="right",
-                    x=1
+            if data['stats']:
+                by_day = data['stats']['by_day']
+                trace_data = {
+                    'x': [row['date'] for row in by_day],
+                    'y': [row['count'] for row in by_day]
+                }
+            else:
+                df = read_tweets_frame(data['tweets_key'], ['created_at'])
+                df['created_at'] = pd.to_datetime(df['created_at'], utc=True)
+                tweet_counts = (
+                    df.groupby(pd.Grouper(key='created_at', freq='1D'))
+                    .size()
+                    .rename('count')
+                    .reset_index()
+                    .rename(columns={'created_at': 'date'})
                 )
-            )
-            
-            # Recent Tweets Table
-            recent_tweets = df.sort_values('created_at', ascending=False).head(10).to_dict('records')
+                trace_data = activity_trace_data(tweet_counts)
+        except Exception as e:
+            logger.error(f"Error in update_activity_chart: {e}")
+            trace_data = {'x': [], 'y': []}
+            title = f"Error loading data: {str(e)}"
+        
+        return patch_figure(title, trace_data)
+    
+    @app.callback(
+        Output('trending-coins-chart', 'figure'),
+        [Input('tweets-store', 'data')],
+        prevent_initial_call=True
+    )
+    def update_trending_chart(data):
+        """Update the trending coins chart from the loaded trends."""
+        try:
+            trends = pd.DataFrame(data['trends'], columns=['coin', 'mention_count'])
+            title = data['message'] or data['trends_message'] or TRENDING_TITLE
+        except Exception as e:
+            logger.error(f"Error in update_trending_chart: {e}")
+            trends = pd.DataFrame(columns=['coin', 'mention_count'])
+            title = f"Error loading data: {str(e)}"
+        
+        return patch_figure(title, trending_trace_data(trends))
+    
+    @app.callback(
+        Output('sentiment-chart', 'figure'),
+        [Input('tweets-store', 'data')],
+        prevent_initial_call=True
+    )
+    def update_sentiment_chart(data):
+        """Update the sentiment chart from the loaded tweets."""
+        try:
+            title = data['message'] or SENTIMENT_TITLE
             
-            return activity_fig, trending_fig, sentiment_fig, recent_tweets
+            if data['stats']:
+                by_sentiment = data['stats']['by_sentiment']
+                trace_data = {'values': [by_sentiment.get(label, 0) for label in SENTIMENT_LABELS]}
+            else:
+                df = read_tweets_frame(data['tweets_key'], ['sentiment'])
+                trace_data = sentiment_trace_data(df['sentiment'].value_counts())
+        except Exception as e:
+            logger.error(f"Error in update_sentiment_chart: {e}")
+            trace_data = {'values': [0] * len(SENTIMENT_LABELS)}
+            title = f"Error loading data: {str(e)}"
+        
+        return patch_figure(title, trace_data)
+    
+    @app.callback(
+        Output('tweet-table', 'data'),
+        [Input('tweets-store', 'data')],
+        prevent_initial_call=True
+    )
+    def update_tweet_table(data):
+        """Update the recent tweets table from the loaded tweets."""
+        try:
+            if data['stats']:
+                # Shape the API's recent tweets like the cached rows
+                recent = data['stats']['recent']
+                if not recent:
+                    return []
+                df = tweets_frame(recent)
+            elif data['tweets_key']:
+                df = read_tweets_frame(data['tweets_key'])
+            else:
+                return []
             
+            return df.nlargest(10, 'created_at').to_dict('records')
         except Exception as e:
-            logger.error(f"Error in update_dashboard: {e}")
-            empty_fig = px.line(title=f"Error loading data: {str(e)}")
-            return empty_fig, empty_fig, empty_fig, []
+            logger.error(f"Error in update_tweet_table: {e}")
+            return []
 
 def start_dashboard(config):
     """Initialize and start the dashboard server."""
@@ -64,28 +64,44 @@ class DataProcessor:
             tweets (list): List of tweet dictionaries
         """
         try:
-            # Extract all coin mentions
-            all_coins = []
-            for tweet in tweets:
-                coins = tweet.get("coins_mentioned", [])
-                if isinstance(coins, str):
-                    # Handle case where coins might be stored as comma-separated string
-                    coins = [coin.strip() for coin in coins.split(",")]
-                all_coins.extend(coins)
-            
-            # Count mentions for each coin
-            coin_counts = Counter(all_coins)
-            
-            # Store in database
-            for coin, count in coin_counts.items():
-                self.db.update_coin_trend(
-                    coin=coin,
-                    mention_count=count,
-                    timestamp=datetime.now()
-                )
+            # Count mentions for each coin in a single vectorized pass
+            coins = pd.Series([tweet.get("coins_mentioned") for tweet in tweets], dtype=object)
+            coin_counts = self._count_coin_mentions(coins)
+            
+            # Store in database with a single bulk write where supported
+            timestamp = datetime.now()
+            records = [
+                {'coin': coin, 'mention_count': count, 'timestamp': timestamp}
+                for coin, count in coin_counts.items()
+            ]
+            
+            if not records:
+                return
+            
+            if hasattr(self.db, 'bulk_update_coin_trends'):
+                self.db.bulk_update_coin_trends(records)
+            else:
+                for record in records:
+                    self.db.update_coin_trend(**record)
         except Exception as e:
             logger.error(f"Error in _update_trends: {e}")
     
+    def _count_coin_mentions(self, coins):
+        """
+        Count coin mentions across a column of per-tweet coin lists.
+        
+        Args:
+            coins (pd.Series): Coin lists or comma-separated coin strings
+            
+        Returns:
+            pd.Series: Mention counts indexed by coin, most mentioned first
+        """
+        # Handle case where coins might be stored as comma-separated string
+        is_str = coins.map(type).eq(str)
+        coins = coins.mask(is_str, coins.where(is_str).str.split(","))
+        
+        return coins.explode().dropna().astype(str).str.strip().value_counts()
+    
     def _update_statistics(self, tweets):
         """
         Update tweet statistics based on recent tweet data.
@@ -110,14 +126,7 @@ class DataProcessor:
             celebrity_counts = df['username'].value_counts().to_dict()
             
             # Most mentioned coins
-            all_coins = []
-            for coins in df['coins_mentioned']:
-                if isinstance(coins, list):
-                    all_coins.extend(coins)
-                elif isinstance(coins, str):
-                    all_coins.extend([coin.strip() for coin in coins.split(",")])
-            
-            top_coins = Counter(all_coins).most_common(10)
+            top_coins = self._count_coin_mentions(df['coins_mentioned']).head(10)
             
             # Store statistics in database
             stats = {
@@ -125,7 +134,7 @@ class DataProcessor:
                 'total_tweets': total_tweets,
                 'sentiment_distribution': sentiment_counts,
                 'tweets_by_celebrity': celebrity_counts,
-                'top_coins': dict(top_coins)
+                'top_coins': top_coins.to_dict()
             }
             
             self.db.update_statistics(stats)
@@ -163,7 +172,15 @@ class DataProcessor:
                 start_date = (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d")
                 end_date = datetime.now().strftime("%Y-%m-%d")
             
-            # Get trend data from database
+            # Let the database group, sort and limit when the handler supports it
+            if hasattr(self.db, 'get_aggregated_coin_trends'):
+                return self.db.get_aggregated_coin_trends(
+                    start_date=start_date,
+                    end_date=end_date,
+                    limit=20
+                )
+            
+            # Otherwise aggregate raw trend data from the database
             trends = self.db.get_coin_trends(start_date=start_date, end_date=end_date)
             
             if not trends:
@@ -228,30 +245,21 @@ class DataProcessor:
                     'top_coins': {}
                 }
             
-            # Aggregate statistics
-            total_tweets = sum(stat.get('total_tweets', 0) for stat in all_stats)
-            
-            # Merge sentiment distributions
-            sentiment_distribution = {}
-            for stat in all_stats:
-                for sentiment, count in stat.get('sentiment_distribution', {}).items():
-                    sentiment_distribution[sentiment] = sentiment_distribution.get(sentiment, 0) + count
-            
-            # Merge celebrity counts
-            tweets_by_celebrity = {}
-            for stat in all_stats:
-                for celebrity, count in stat.get('tweets_by_celebrity', {}).items():
-                    tweets_by_celebrity[celebrity] = tweets_by_celebrity.get(celebrity, 0) + count
-            
-            # Merge coin counts
-            top_coins = {}
+            # Aggregate statistics in a single pass
+            total_tweets = 0
+            sentiment_distribution = Counter()
+            tweets_by_celebrity = Counter()
+            top_coins = Counter()
             for stat in all_stats:
-                for coin, count in stat.get('top_coins', {}).items():
-                    top_coins[coin] = top_coins.get(coin, 0) + count
+                total_tweets += stat.get('total_tweets', 0)
+                sentiment_distribution.update(stat.get('sentiment_distribution', {}))
+                tweets_by_celebrity.update(stat.get('tweets_by_celebrity', {}))
+                top_coins.update(stat.get('top_coins', {}))
             
             # Sort and limit
-            tweets_by_celebrity = dict(sorted(tweets_by_celebrity.items(), key=lambda x: x[1], reverse=True)[:10])
-            top_coins = dict(sorted(top_coins.items(), key=lambda x: x[1], reverse=True)[:10])
+            sentiment_distribution = dict(sentiment_distribution)
+            tweets_by_celebrity = dict(tweets_by_celebrity.most_common(10))
+            top_coins = dict(top_coins.most_common(10))
             
             return {
                 'total_tweets': total_tweets,
@@ -316,10 +324,9 @@ class DataProcessor:
             top_influencers = df['username'].value_counts().to_dict()
             top_influencers = dict(sorted(top_influencers.items(), key=lambda x: x[1], reverse=True)[:5])
             
-            # Daily mention trend
-            df['date'] = pd.to_datetime(df['created_at']).dt.date
-            mention_trend = df.groupby('date').size().reset_index()
-            mention_trend.columns = ['date', 'count']
+            # Daily mention trend, bucketed on datetime64 days rather than date objects
+            df['date'] = pd.to_datetime(df['created_at'], utc=True, errors='coerce').dt.floor('D')
+            mention_trend = df.groupby('date', sort=True).size().reset_index(name='count')
             mention_trend = mention_trend.to_dict('records')
             
             return {
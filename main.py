@@ -5,7 +5,6 @@ Initializes and coordinates all the components of the system.
 """
 
 import logging
-import time
 from concurrent.futures import ThreadPoolExecutor
 import threading
 
@@ -29,6 +28,16 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+def run_periodic_processing(data_processor, interval, stop_event):
+    """Process recent data every `interval` seconds until `stop_event` is set."""
+    while not stop_event.is_set():
+        try:
+            data_processor.process_recent_data()
+            stop_event.wait(interval)
+        except Exception as e:
+            logger.error(f"Error in processing loop: {e}")
+            stop_event.wait(10)  # Wait before retrying
+
 def main():
     """Initialize and start all components of the application."""
     logger.info("Starting Memecoin Tweet Tracker")
@@ -68,21 +77,23 @@ def main():
             )
             api_thread.start()
             
-            # Start the dashboard server
-            start_dashboard(config["dashboard"])
+            # Start periodic data processing in a separate thread
+            stop_event = threading.Event()
+            processing_thread = threading.Thread(
+                target=run_periodic_processing,
+                args=(data_processor, config["processing_interval"], stop_event),
+                daemon=True
+            )
+            processing_thread.start()
             
-            # Start periodic data processing
-            while True:
-                try:
-                    # Process data periodically
-                    data_processor.process_recent_data()
-                    time.sleep(config["processing_interval"])
-                except KeyboardInterrupt:
-                    logger.info("Shutting down Memecoin Tweet Tracker")
-                    break
-                except Exception as e:
-                    logger.error(f"Error in main loop: {e}")
-                    time.sleep(10)  # Wait before retrying
+            # Start the dashboard server (blocks until shutdown)
+            try:
+                start_dashboard(config["dashboard"])
+            except KeyboardInterrupt:
+                logger.info("Shutting down Memecoin Tweet Tracker")
+            finally:
+                stop_event.set()
+                notification_service.close()
 
     except Exception as e:
         logger.error(f"Error in main: {e}")
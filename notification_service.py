@@ -3,24 +3,207 @@ Notification Service for the Memecoin Tweet Tracker.
 Handles alerts and notifications for significant events and trends.
 """
 
+import atexit
+import hashlib
 import logging
+import orjson
+import queue
 import smtplib
+import threading
+import time
+from collections import OrderedDict, deque
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
+from jinja2 import Template
 from datetime import datetime
 from typing import List, Dict, Any
-import json
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
+# Reconnect after this many messages to stay under provider per-connection limits
+MAX_MESSAGES_PER_CONNECTION = 1000
+
+# Seconds to wait on SMTP socket operations before giving up on the server
+SMTP_TIMEOUT = 30
+
+# Seconds close() waits for the worker to send queued alerts before abandoning them
+CLOSE_TIMEOUT = 60
+
+# Maximum number of queued alerts sent together over one connection
+EMAIL_BATCH_SIZE = 100
+
+# A batch is abandoned once at least EMAIL_ABORT_MIN_SENDS sends were tried
+# and a third of them failed; the worker then backs off exponentially, up
+# to EMAIL_MAX_BACKOFF seconds, before draining again
+EMAIL_ABORT_MIN_SENDS = 30
+EMAIL_MAX_BACKOFF = 300
+
+# Identical trend alerts (same coin and volume bucket) are suppressed for this
+# many seconds; at most ALERT_DEDUP_MAX_KEYS recent alerts are remembered
+ALERT_DEDUP_WINDOW = 600
+ALERT_DEDUP_MAX_KEYS = 1024
+
+# Notifications are appended to this file as they happen; only the most
+# recent NOTIFICATION_HISTORY_SIZE are kept in memory
+NOTIFICATION_HISTORY_FILE = Path("data/notification_history.jsonl")
+NOTIFICATION_HISTORY_SIZE = 1000
+
+TREND_ALERT_TEMPLATE = """
+<h2>Memecoin Trend Alert</h2>
+<p><strong>Coin:</strong> {{ coin }}</p>
+<p><strong>Volume:</strong> {{ volume }}</p>
+<p><strong>Sentiment Score:</strong> {{ sentiment }}</p>
+<p><strong>Top Mentions:</strong></p>
+<ul>
+{% for mention in mentions %}<li>{{ mention.username }}: {{ mention.text }}</li>{% endfor %}
+</ul>
+"""
+
+CELEB_ALERT_TEMPLATE = """
+<h2>Celebrity Tweet Alert</h2>
+<p><strong>Author:</strong> {{ author.name }} (@{{ author.username }})</p>
+<p><strong>Followers:</strong> {{ author.followers_count }}</p>
+<p><strong>Tweet:</strong> {{ text }}</p>
+<p><strong>Engagement:</strong></p>
+<ul>
+    <li>Likes: {{ engagement.likes }}</li>
+    <li>Retweets: {{ engagement.retweets }}</li>
+    <li>Replies: {{ engagement.replies }}</li>
+</ul>
+"""
+
 class NotificationService:
     def __init__(self, config: Dict[str, Any]):
         """Initialize the notification service with configuration."""
         self.config = config
         self.email_config = config.get('email', {})
         self.alert_thresholds = config.get('alert_thresholds', {})
-        self.notification_history = []
+        self.notification_history = deque(maxlen=NOTIFICATION_HISTORY_SIZE)
+        self._history_file = self._open_history_file()
+        self._recent_alerts = OrderedDict()
+
+        # Alert bodies are compiled once and escape tweet content when rendered
+        self._trend_template = Template(TREND_ALERT_TEMPLATE, autoescape=True)
+        self._celeb_template = Template(CELEB_ALERT_TEMPLATE, autoescape=True)
+
+        # Persistent SMTP connection reused across alerts
+        self._smtp = None
+        self._sent_on_conn = 0
+        self._smtp_lock = threading.Lock()
+
+        # Alerts are queued and sent in batches by a background worker
+        self._queue = queue.Queue()
+        self._stop_event = threading.Event()
+        self._backoff = 0
+        self._worker = threading.Thread(target=self._flush_loop, name='email-alerts', daemon=True)
+        self._worker.start()
+
+        # Flush queued alerts at interpreter exit even if close() is never called
+        atexit.register(self.close)
+
+    def _open_history_file(self):
+        """Open the notification history file for appending."""
+        try:
+            NOTIFICATION_HISTORY_FILE.parent.mkdir(parents=True, exist_ok=True)
+            return open(NOTIFICATION_HISTORY_FILE, 'a', buffering=1)
+        except Exception as e:
+            logger.error(f"Error opening notification history file: {e}")
+            return None
+
+    def _get_smtp(self) -> smtplib.SMTP:
+        """Return an authenticated SMTP connection, reusing the current one if healthy."""
+        if self._smtp is not None:
+            try:
+                if self._smtp.noop()[0] == 250:
+                    return self._smtp
+            except (smtplib.SMTPException, OSError):
+                pass
+            self._close_smtp()
+
+        server = smtplib.SMTP(
+            self.email_config['smtp_server'],
+            self.email_config['smtp_port'],
+            timeout=SMTP_TIMEOUT
+        )
+        try:
+            server.ehlo()
+            server.starttls()
+            server.ehlo()
+            server.login(
+                self.email_config['sender_email'],
+                self.email_config['password']
+            )
+        except Exception:
+            server.close()
+            raise
+
+        self._smtp = server
+        self._sent_on_conn = 0
+        return server
+
+    def _close_smtp(self) -> None:
+        """Close the persistent SMTP connection, if open."""
+        if self._smtp is None:
+            return
+        try:
+            self._smtp.quit()
+        except (smtplib.SMTPException, OSError):
+            self._smtp.close()
+        finally:
+            self._smtp = None
+            self._sent_on_conn = 0
+
+    def close(self) -> None:
+        """Send any queued alerts, stop the worker and close the SMTP connection and history file."""
+        if self._stop_event.is_set():
+            return
+        
+        self._stop_event.set()
+        if self._worker.is_alive():
+            self._worker.join(CLOSE_TIMEOUT)
+        
+        if self._worker.is_alive():
+            # The worker still owns the SMTP connection; as a daemon thread it
+            # ends with the interpreter
+            logger.warning(f"Email worker did not finish within {CLOSE_TIMEOUT}s; abandoning unsent alerts")
+        else:
+            with self._smtp_lock:
+                self._close_smtp()
+        
+        if self._history_file is not None:
+            self._history_file.close()
+            self._history_file = None
+
+    def _build_message(self, subject: str, body: str, recipients: List[str]) -> MIMEMultipart:
+        """Build an HTML email message."""
+        msg = MIMEMultipart()
+        msg['From'] = self.email_config['sender_email']
+        msg['To'] = ', '.join(recipients)
+        msg['Subject'] = subject
+
+        msg.attach(MIMEText(body, 'html'))
+        return msg
+
+    def _send_message(self, msg: MIMEMultipart) -> bool:
+        """Send a message over the persistent SMTP connection."""
+        with self._smtp_lock:
+            try:
+                server = self._get_smtp()
+                try:
+                    server.send_message(msg)
+                except (smtplib.SMTPServerDisconnected, OSError):
+                    # Drop the broken connection so the next alert reconnects
+                    self._close_smtp()
+                    raise
+
+                self._sent_on_conn += 1
+                if self._sent_on_conn >= MAX_MESSAGES_PER_CONNECTION:
+                    self._close_smtp()
+                return True
+            except Exception as e:
+                logger.error(f"Error sending email to {msg['To']}: {e}")
+                return False
 
     def send_email_alert(self, subject: str, body: str, recipients: List[str]) -> bool:
         """Send email alert to specified recipients."""
@@ -29,20 +212,9 @@ class NotificationService:
                 logger.info("Email notifications are disabled")
                 return False
 
-            msg = MIMEMultipart()
-            msg['From'] = self.email_config['sender_email']
-            msg['To'] = ', '.join(recipients)
-            msg['Subject'] = subject
-
-            msg.attach(MIMEText(body, 'html'))
-
-            with smtplib.SMTP(self.email_config['smtp_server'], self.email_config['smtp_port']) as server:
-                server.starttls()
-                server.login(
-                    self.email_config['sender_email'],
-                    self.email_config['password']
-                )
-                server.send_message(msg)
+            msg = self._build_message(subject, body, recipients)
+            if not self._send_message(msg):
+                return False
 
             logger.info(f"Email alert sent to {len(recipients)} recipients")
             return True
@@ -50,52 +222,122 @@ class NotificationService:
             logger.error(f"Error sending email alert: {e}")
             return False
 
+    def queue_email_alert(self, subject: str, body: str, recipients: List[str]) -> bool:
+        """Queue email alert for the background worker to send."""
+        try:
+            if not self.email_config.get('enabled', False):
+                logger.info("Email notifications are disabled")
+                return False
+
+            self._queue.put(self._build_message(subject, body, recipients))
+            return True
+        except Exception as e:
+            logger.error(f"Error queueing email alert: {e}")
+            return False
+
+    def _flush_loop(self) -> None:
+        """Send queued alerts in batches until stopped and the queue is empty."""
+        while not (self._stop_event.is_set() and self._queue.empty()):
+            try:
+                batch = [self._queue.get(timeout=1.0)]
+            except queue.Empty:
+                continue
+
+            while len(batch) < EMAIL_BATCH_SIZE:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            # One failed recipient must not stop the rest of the batch, but
+            # a third failing means the server is rejecting us
+            failed = 0
+            for total, msg in enumerate(batch, start=1):
+                if not self._send_message(msg):
+                    failed += 1
+                if total >= EMAIL_ABORT_MIN_SENDS and failed * 3 >= total:
+                    self._abort_batch(batch[total:], failed, total)
+                    break
+            else:
+                if failed * 3 < len(batch):
+                    self._backoff = 0
+                logger.info(f"Sent {len(batch) - failed} of {len(batch)} queued email alerts")
+
+    def _abort_batch(self, remaining: List[MIMEMultipart], failed: int, total: int) -> None:
+        """Requeue the unsent rest of a failing batch and back off before retrying."""
+        with self._smtp_lock:
+            self._close_smtp()
+
+        if self._stop_event.is_set():
+            # Shutting down: do not keep retrying against a failing server
+            logger.error(f"Dropping {len(remaining)} queued email alerts after {failed} of {total} sends failed")
+            return
+
+        for msg in remaining:
+            self._queue.put(msg)
+
+        delay = min(EMAIL_MAX_BACKOFF, 2 ** self._backoff)
+        self._backoff += 1
+        logger.warning(
+            f"Aborted email batch after {failed} of {total} sends failed; "
+            f"requeued {len(remaining)} alerts, retrying in {delay}s"
+        )
+        self._stop_event.wait(delay)
+
     def check_trend_alert(self, trend_data: Dict[str, Any]) -> bool:
         """Check if trend data meets alert criteria."""
         try:
-            # Check volume threshold
-            if trend_data['volume'] > self.alert_thresholds.get('volume_threshold', 1000):
-                self.send_trend_alert(trend_data)
-                return True
+            # Check volume and sentiment thresholds
+            volume_alert = trend_data['volume'] > self.alert_thresholds.get('volume_threshold', 1000)
+            sentiment_alert = trend_data['sentiment_score'] > self.alert_thresholds.get('sentiment_threshold', 0.8)
+            if not (volume_alert or sentiment_alert):
+                return False
 
-            # Check sentiment threshold
-            if trend_data['sentiment_score'] > self.alert_thresholds.get('sentiment_threshold', 0.8):
-                self.send_trend_alert(trend_data)
-                return True
+            if self._is_duplicate_alert(trend_data):
+                logger.info(f"Suppressing duplicate trend alert for {trend_data['coin_name']}")
+                return False
 
-            return False
+            self.send_trend_alert(trend_data)
+            return True
         except Exception as e:
             logger.error(f"Error checking trend alert: {e}")
             return False
 
+    def _is_duplicate_alert(self, trend_data: Dict[str, Any]) -> bool:
+        """Check if an equivalent trend alert was sent within the dedup window."""
+        key = hashlib.blake2b(
+            f"{trend_data['coin_name']}|{int(trend_data['volume'] // 100)}".encode(),
+            digest_size=8
+        ).digest()
+        now = time.monotonic()
+
+        last_sent = self._recent_alerts.get(key)
+        if last_sent is not None and now - last_sent < ALERT_DEDUP_WINDOW:
+            return True
+
+        self._recent_alerts[key] = now
+        self._recent_alerts.move_to_end(key)
+        while len(self._recent_alerts) > ALERT_DEDUP_MAX_KEYS:
+            self._recent_alerts.popitem(last=False)
+        return False
+
     def send_trend_alert(self, trend_data: Dict[str, Any]) -> None:
         """Send alert for significant trend."""
         try:
             subject = f"Memecoin Alert: {trend_data['coin_name']} Trending"
             
-            body = f"""
-            <h2>Memecoin Trend Alert</h2>
-            <p><strong>Coin:</strong> {trend_data['coin_name']}</p>
-            <p><strong>Volume:</strong> {trend_data['volume']}</p>
-            <p><strong>Sentiment Score:</strong> {trend_data['sentiment_score']}</p>
-            <p><strong>Top Mentions:</strong></p>
-            <ul>
-            """
-            
-            for mention in trend_data.get('top_mentions', [])[:5]:
-                body += f"<li>{mention['username']}: {mention['text']}</li>"
-            
-            body += "</ul>"
+            body = self._trend_template.render(
+                coin=trend_data['coin_name'],
+                volume=trend_data['volume'],
+                sentiment=trend_data['sentiment_score'],
+                mentions=trend_data.get('top_mentions', [])[:5]
+            )
 
             recipients = self.email_config.get('recipients', [])
-            self.send_email_alert(subject, body, recipients)
+            self.queue_email_alert(subject, body, recipients)
             
             # Log notification
-            self.notification_history.append({
-                'timestamp': datetime.utcnow(),
-                'type': 'trend_alert',
-                'data': trend_data
-            })
+            self._record_notification('trend_alert', trend_data)
         except Exception as e:
             logger.error(f"Error sending trend alert: {e}")
 
@@ -104,45 +346,44 @@ class NotificationService:
         try:
             subject = f"Celebrity Alert: {tweet_data['author']['username']} Tweeted About Memecoin"
             
-            body = f"""
-            <h2>Celebrity Tweet Alert</h2>
-            <p><strong>Author:</strong> {tweet_data['author']['name']} (@{tweet_data['author']['username']})</p>
-            <p><strong>Followers:</strong> {tweet_data['author']['followers_count']}</p>
-            <p><strong>Tweet:</strong> {tweet_data['text']}</p>
-            <p><strong>Engagement:</strong></p>
-            <ul>
-                <li>Likes: {tweet_data['engagement']['likes']}</li>
-                <li>Retweets: {tweet_data['engagement']['retweets']}</li>
-                <li>Replies: {tweet_data['engagement']['replies']}</li>
-            </ul>
-            """
+            body = self._celeb_template.render(
+                author=tweet_data['author'],
+                text=tweet_data['text'],
+                engagement=tweet_data['engagement']
+            )
 
             recipients = self.email_config.get('recipients', [])
-            self.send_email_alert(subject, body, recipients)
+            self.queue_email_alert(subject, body, recipients)
             
             # Log notification
-            self.notification_history.append({
-                'timestamp': datetime.utcnow(),
-                'type': 'celeb_alert',
-                'data': tweet_data
-            })
+            self._record_notification('celeb_alert', tweet_data)
         except Exception as e:
             logger.error(f"Error sending celebrity alert: {e}")
 
+    def _record_notification(self, notification_type: str, data: Dict[str, Any]) -> None:
+        """Keep a notification in memory and append it to the history file."""
+        entry = {
+            'timestamp': datetime.utcnow(),
+            'type': notification_type,
+            'data': data
+        }
+        self.notification_history.append(entry)
+
+        if self._history_file is not None:
+            try:
+                self._history_file.write(orjson.dumps(entry, default=str, option=orjson.OPT_NON_STR_KEYS).decode() + '\n')
+            except Exception as e:
+                logger.error(f"Error writing notification history: {e}")
+
     def get_notification_history(self, limit: int = 100) -> List[Dict[str, Any]]:
         """Get recent notification history."""
-        return self.notification_history[-limit:]
+        return list(self.notification_history)[-limit:]
 
     def save_notification_history(self) -> None:
-        """Save notification history to file."""
+        """Flush notification history to file; entries are appended as they are sent."""
         try:
-            history_file = Path("data/notification_history.json")
-            history_file.parent.mkdir(parents=True, exist_ok=True)
-            
-            with open(history_file, 'w') as f:
-                json.dump(self.notification_history, f, default=str)
-            
-            logger.info("Notification history saved successfully")
+            if self._history_file is not None:
+                self._history_file.flush()
         except Exception as e:
             logger.error(f"Error saving notification history: {e}")
 
@@ -1,32 +1,43 @@
-from collections import defaultdict, deque
+import heapq
 
 class Network:
     def __init__(self, n):
-        self.graph = defaultdict(dict)
+        # Neighbor -> cost map per node id
+        self.adj = [{} for _ in range(n + 1)]
         self.n = n
+        self._cache = {}
 
     def add_edge(self, u, v, cost):
-        self.graph[u][v] = cost
-        self.graph[v][u] = cost
+        self.adj[u][v] = cost
+        self.adj[v][u] = cost
+        self._cache.clear()
 
     def update_cost(self, u, v, new_cost):
-        self.graph[u][v] = new_cost
-        self.graph[v][u] = new_cost
+        self.adj[u][v] = new_cost
+        self.adj[v][u] = new_cost
+        self._cache.clear()
 
     def transmission_cost(self, start, end):
-        visited = [False] * (self.n + 1)
-        queue = deque([(start, 0)])
-        while queue:
-            node, cost = queue.popleft()
-            if node == end:
-                return cost
-            if visited[node]:
+        if (start, end) in self._cache:
+            return self._cache[(start, end)]
+
+        dist = [None] * (self.n + 1)
+        heap = [(0, start)]
+        result = -1
+        while heap:
+            cost, node = heapq.heappop(heap)
+            if dist[node] is not None:
                 continue
-            visited[node] = True
-            for neighbor, edge_cost in self.graph[node].items():
-                if not visited[neighbor]:
-                    queue.append((neighbor, cost + edge_cost))
-        return -1
+            dist[node] = cost
+            if node == end:
+                result = cost
+                break
+            for neighbor, edge_cost in self.adj[node].items():
+                if dist[neighbor] is None:
+                    heapq.heappush(heap, (cost + edge_cost, neighbor))
+
+        self._cache[(start, end)] = self._cache[(end, start)] = result
+        return result
 
 class Solution:
     def processNetwork(self):
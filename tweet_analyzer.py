@@ -3,15 +3,23 @@ Tweet analyzer for the Memecoin Tweet Tracker.
 Analyzes tweets to extract mentions of memecoins and sentiment.
 """
 
+import hashlib
 import logging
 import re
 import json
+import ahocorasick
 import nltk
 from nltk.sentiment import SentimentIntensityAnalyzer
-from collections import Counter
+from collections import Counter, OrderedDict
 
 logger = logging.getLogger(__name__)
 
+# Cashtag mentions (e.g., $DOGE, $SHIB)
+CASHTAG_PATTERN = re.compile(r'\$([a-zA-Z0-9]+)')
+
+# Number of distinct tweet texts whose coins and sentiment are remembered
+TEXT_ANALYSIS_CACHE_SIZE = 100_000
+
 class TweetAnalyzer:
     """
     Analyzes tweets to identify mentioned coins, determine sentiment,
@@ -30,6 +38,17 @@ class TweetAnalyzer:
         
         # Load custom sentiment lexicon for crypto terms
         self.crypto_lexicon = self._load_crypto_lexicon()
+        # Single-character terms (emojis) are matched by set intersection,
+        # longer terms by an Aho-Corasick automaton
+        self._lexicon_chars = frozenset(term for term in self.crypto_lexicon if len(term) == 1)
+        self._lexicon_automaton = self._build_lexicon_automaton()
+        
+        # Keyword automaton, rebuilt only when the keyword list changes
+        self._keywords = None
+        self._keyword_automaton = None
+        
+        # Coins and sentiment by text digest, in least recently used order
+        self._text_analysis_cache = OrderedDict()
         
         logger.info("Tweet analyzer initialized")
     
@@ -72,6 +91,25 @@ class TweetAnalyzer:
             logger.error(f"Error loading crypto lexicon: {e}")
             return {}
     
+    def _build_lexicon_automaton(self):
+        """
+        Build an Aho-Corasick automaton over the multi-character crypto
+        lexicon terms.
+        
+        Returns:
+            ahocorasick.Automaton: Automaton mapping each term to itself, or
+            None if there are no multi-character terms
+        """
+        terms = [term for term in self.crypto_lexicon if len(term) > 1]
+        if not terms:
+            return None
+        
+        automaton = ahocorasick.Automaton()
+        for term in terms:
+            automaton.add_word(term, term)
+        automaton.make_automaton()
+        return automaton
+    
     def analyze_tweet(self, tweet, keywords):
         """
         Analyze a tweet to extract information about mentioned coins and sentiment.
@@ -84,13 +122,12 @@ class TweetAnalyzer:
             dict: Analysis results including mentioned coins, sentiment, etc.
         """
         try:
-            text = tweet.get("text", "").lower()
-            
-            # Extract mentioned coins
-            coins_mentioned = self._extract_coins(text, keywords)
+            # Lowercase once; every helper below works on the lowercased text
+            text_lower = tweet.get("text", "").lower()
             
-            # Determine sentiment
-            sentiment = self._analyze_sentiment(text)
+            # Extract mentioned coins and determine sentiment
+            coins_mentioned, sentiment = self._analyze_text(text_lower, keywords)
+            coins_mentioned = list(coins_mentioned)
             
             # Calculate importance score
             importance_score = self._calculate_importance(tweet, coins_mentioned, sentiment)
@@ -108,39 +145,89 @@ class TweetAnalyzer:
                 "importance_score": 0.0
             }
     
-    def _extract_coins(self, text, keywords):
+    def _analyze_text(self, text_lower, keywords):
+        """
+        Extract coins and sentiment from tweet text, reusing earlier results
+        for identical texts such as retweets.
+        
+        Args:
+            text_lower (str): Lowercased tweet text
+            keywords (list): List of keywords to look for
+            
+        Returns:
+            tuple: Tuple of mentioned coins and sentiment category
+        """
+        # Refresh the keyword automaton first; a new keyword list clears the cache
+        self._get_keyword_automaton(keywords)
+        
+        key = hashlib.blake2b(text_lower.encode(), digest_size=16).digest()
+        result = self._text_analysis_cache.get(key)
+        if result is not None:
+            self._text_analysis_cache.move_to_end(key)
+            return result
+        
+        result = (tuple(self._extract_coins(text_lower, keywords)), self._analyze_sentiment(text_lower))
+        self._text_analysis_cache[key] = result
+        if len(self._text_analysis_cache) > TEXT_ANALYSIS_CACHE_SIZE:
+            self._text_analysis_cache.popitem(last=False)
+        return result
+    
+    def _extract_coins(self, text_lower, keywords):
         """
         Extract mentions of coins from tweet text.
         
         Args:
-            text (str): Tweet text
+            text_lower (str): Lowercased tweet text
             keywords (list): List of keywords to look for
             
         Returns:
             list: List of mentioned coins
         """
         coins = []
-        text_lower = text.lower()
         
-        # Look for keyword matches
-        for keyword in keywords:
-            if keyword.lower() in text_lower:
-                coins.append(keyword)
+        # Look for keyword matches in a single pass over the text
+        automaton = self._get_keyword_automaton(keywords)
+        if automaton is not None:
+            coins.extend(keyword for _, keyword in automaton.iter(text_lower))
         
         # Look for cashtag mentions (e.g., $DOGE, $SHIB)
-        cashtag_pattern = r'\$([a-zA-Z0-9]+)'
-        cashtags = re.findall(cashtag_pattern, text)
-        coins.extend(cashtags)
+        coins.extend(CASHTAG_PATTERN.findall(text_lower))
         
         # Remove duplicates
         return list(set(coins))
     
-    def _analyze_sentiment(self, text):
+    def _get_keyword_automaton(self, keywords):
+        """
+        Get an Aho-Corasick automaton matching the given keywords.
+        
+        Args:
+            keywords (list): List of keywords to look for
+            
+        Returns:
+            ahocorasick.Automaton: Automaton mapping lowercase keywords to the
+            original keyword, or None if there are no keywords
+        """
+        keywords = tuple(keywords)
+        if keywords != self._keywords:
+            automaton = None
+            if keywords:
+                automaton = ahocorasick.Automaton()
+                for keyword in keywords:
+                    automaton.add_word(keyword.lower(), keyword)
+                automaton.make_automaton()
+            
+            self._keywords = keywords
+            self._keyword_automaton = automaton
+            self._text_analysis_cache.clear()
+        
+        return self._keyword_automaton
+    
+    def _analyze_sentiment(self, text_lower):
         """
         Analyze sentiment of tweet text.
         
         Args:
-            text (str): Tweet text
+            text_lower (str): Lowercased tweet text
             
         Returns:
             str: Sentiment category ('positive', 'negative', 'neutral')
@@ -149,14 +236,17 @@ class TweetAnalyzer:
             return "neutral"
         
         # Get base sentiment scores from NLTK
-        sentiment_scores = self.sentiment_analyzer.polarity_scores(text)
-        
-        # Adjust with crypto-specific lexicon
-        for term, score in self.crypto_lexicon.items():
-            if term in text.lower():
-                sentiment_scores['compound'] += score
-                # Ensure the score stays within bounds
-                sentiment_scores['compound'] = max(-1.0, min(1.0, sentiment_scores['compound']))
+        sentiment_scores = self.sentiment_analyzer.polarity_scores(text_lower)
+        
+        # Adjust with crypto-specific lexicon, counting each term found once
+        terms_found = self._lexicon_chars.intersection(text_lower)
+        if self._lexicon_automaton is not None:
+            terms_found = terms_found.union(term for _, term in self._lexicon_automaton.iter(text_lower))
+        
+        if terms_found:
+            adjustment = sum(self.crypto_lexicon[term] for term in terms_found)
+            # Ensure the score stays within bounds
+            sentiment_scores['compound'] = max(-1.0, min(1.0, sentiment_scores['compound'] + adjustment))
         
         # Determine sentiment category based on compound score
         if sentiment_scores['compound'] >= 0.05:
@@ -4,16 +4,144 @@ Processes and analyzes tweets from a dataset instead of real-time streaming.
 """
 
 import logging
-import json
+import os
+import orjson
 import pandas as pd
+import queue
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from typing import List, Dict, Any, Generator
+from typing import List, Dict, Any, Generator, Optional
 from pathlib import Path
-from textblob import TextBlob
+import nltk
+from nltk.sentiment import SentimentIntensityAnalyzer
 import re
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of processed batches waiting for the database writer
+WRITE_QUEUE_SIZE = 8
+
+def _load_sentiment_analyzer():
+    """Load the VADER sentiment analyzer."""
+    try:
+        nltk.download('vader_lexicon', quiet=True)
+        return SentimentIntensityAnalyzer()
+    except Exception as e:
+        logger.error(f"Error initializing VADER: {e}")
+        return None
+
+class ChunkProcessor:
+    """Turns raw dataset chunks into tweet documents; runs in worker processes."""
+
+    def __init__(self, memecoin_patterns: List[str]):
+        """Initialize the chunk processor with memecoin patterns and a sentiment analyzer."""
+        self._memecoin_re = re.compile('|'.join(memecoin_patterns), re.IGNORECASE)
+        self.sentiment_analyzer = _load_sentiment_analyzer()
+
+    def process_chunk(self, chunk: pd.DataFrame) -> List[Dict[str, Any]]:
+        """Process a chunk of tweets with column-wise operations."""
+        try:
+            # Skip tweets missing required fields or with unparseable timestamps
+            chunk = chunk.assign(created_at=pd.to_datetime(chunk['created_at'], utc=True, errors='coerce'))
+            valid = (
+                chunk[['id', 'created_at']].notna().all(axis=1)
+                & chunk['text'].map(lambda text: isinstance(text, str))
+                & chunk['author'].map(lambda author: isinstance(author, dict) and bool(author.get('username')))
+            )
+            if not valid.all():
+                logger.warning(f"Skipping {int((~valid).sum())} tweets with missing fields")
+                chunk = chunk[valid]
+
+            processed = pd.DataFrame({
+                'tweet_id': chunk['id'].astype(str),
+                'text': chunk['text'],
+                'created_at': chunk['created_at'],
+                'author': [
+                    {
+                        'username': author['username'],
+                        'name': author.get('name', ''),
+                        'followers_count': author.get('followers_count', 0)
+                    }
+                    for author in chunk['author']
+                ],
+                'engagement': [
+                    {'likes': likes, 'retweets': retweets, 'replies': replies}
+                    for likes, retweets, replies in zip(
+                        self._count_column(chunk, 'like_count'),
+                        self._count_column(chunk, 'retweet_count'),
+                        self._count_column(chunk, 'reply_count')
+                    )
+                ],
+                'mentions': self._list_column(chunk, 'mentions'),
+                'hashtags': self._list_column(chunk, 'hashtags'),
+                'urls': self._list_column(chunk, 'urls'),
+                'processed_at': datetime.utcnow(),
+                'sentiment': chunk['text'].map(self._analyze_sentiment),
+                'memecoin_mentions': chunk['text'].str.findall(self._memecoin_re).map(lambda found: list(set(found)))
+            }, index=chunk.index)
+
+            return processed.to_dict('records')
+        except Exception as e:
+            if len(chunk) > 1:
+                # Fall back to one tweet at a time so a bad record only drops itself
+                logger.warning(f"Error processing tweet chunk, retrying per tweet: {e}")
+                return [
+                    tweet
+                    for position in range(len(chunk))
+                    for tweet in self.process_chunk(chunk.iloc[[position]])
+                ]
+            
+            tweet_id = chunk['id'].iloc[0] if 'id' in chunk and len(chunk) else None
+            logger.error(f"Error processing tweet {tweet_id}: {e}")
+            return []
+
+    @staticmethod
+    def _count_column(chunk: pd.DataFrame, column: str) -> List[int]:
+        """Get an engagement count column, defaulting missing values to 0."""
+        if column not in chunk:
+            return [0] * len(chunk)
+        return pd.to_numeric(chunk[column], errors='coerce').fillna(0).astype(int).tolist()
+
+    @staticmethod
+    def _list_column(chunk: pd.DataFrame, column: str) -> List[List[Any]]:
+        """Get a list-valued column, defaulting missing values to []."""
+        if column not in chunk:
+            return [[] for _ in range(len(chunk))]
+        return [value if isinstance(value, list) else [] for value in chunk[column]]
+
+    def _analyze_sentiment(self, text: str) -> Dict[str, float]:
+        """Analyze sentiment of tweet text using VADER."""
+        try:
+            if not self.sentiment_analyzer:
+                return {'positive': 0.0, 'negative': 0.0, 'neutral': 1.0}
+
+            # Get compound score (-1 to 1) and convert to positive/negative/neutral
+            compound = self.sentiment_analyzer.polarity_scores(text)['compound']
+            
+            if compound >= 0.05:
+                return {'positive': 1.0, 'negative': 0.0, 'neutral': 0.0}
+            elif compound <= -0.05:
+                return {'positive': 0.0, 'negative': 1.0, 'neutral': 0.0}
+            else:
+                return {'positive': 0.0, 'negative': 0.0, 'neutral': 1.0}
+        except Exception as e:
+            logger.error(f"Error analyzing sentiment: {e}")
+            return {'positive': 0.0, 'negative': 0.0, 'neutral': 1.0}
+
+# Chunk processor for the current dataset worker process, set by _init_worker
+_chunk_processor = None
+
+def _init_worker(memecoin_patterns: List[str]) -> None:
+    """Create the chunk processor for a dataset worker process."""
+    global _chunk_processor
+    _chunk_processor = ChunkProcessor(memecoin_patterns)
+
+def _process_chunk(chunk: pd.DataFrame) -> List[Dict[str, Any]]:
+    """Process a dataset chunk in a worker process."""
+    return _chunk_processor.process_chunk(chunk)
+
 class TweetProcessor:
     def __init__(self, config: Dict[str, Any], db_handler):
         """Initialize the tweet processor with configuration and database handler."""
@@ -21,9 +149,12 @@ class TweetProcessor:
         self.db_handler = db_handler
         self.dataset_path = Path(config['dataset']['path'])
         self.batch_size = config['dataset'].get('batch_size', 1000)
+        self.workers = config['dataset'].get('workers')
         self.celebrities = self._load_celebrities()
         self.keywords = self._load_keywords()
         self.memecoin_patterns = self._load_memecoin_patterns()
+        # Single alternation so each tweet is scanned once for all memecoins
+        self._memecoin_re = re.compile('|'.join(self.memecoin_patterns), re.IGNORECASE)
 
     def _load_celebrities(self) -> List[str]:
         """Load list of celebrities to track from database."""
@@ -44,115 +175,145 @@ class TweetProcessor:
 
     def _load_memecoin_patterns(self) -> List[str]:
         """Load patterns for identifying memecoins in text."""
+        # Non-capturing groups so findall/str.findall return the full match
         return [
-            r'\b(DOGE|Dogecoin)\b',
-            r'\b(SHIB|Shiba Inu)\b',
-            r'\b(PEPE|PepeCoin)\b',
-            r'\b(FLOKI|Floki Inu)\b',
-            r'\b(BONK|Bonk)\b',
-            r'\b(MOON|MoonCoin)\b',
-            r'\b(WOJAK|Wojak)\b'
+            r'\b(?:DOGE|Dogecoin)\b',
+            r'\b(?:SHIB|Shiba Inu)\b',
+            r'\b(?:PEPE|PepeCoin)\b',
+            r'\b(?:FLOKI|Floki Inu)\b',
+            r'\b(?:BONK|Bonk)\b',
+            r'\b(?:MOON|MoonCoin)\b',
+            r'\b(?:WOJAK|Wojak)\b'
         ]
 
-    def _process_tweet(self, tweet: Dict[str, Any]) -> Dict[str, Any]:
-        """Process a tweet and extract relevant information."""
-        try:
-            # Extract basic tweet information
-            tweet_data = {
-                'tweet_id': str(tweet['id']),
-                'text': tweet['text'],
-                'created_at': datetime.fromisoformat(tweet['created_at'].replace('Z', '+00:00')),
-                'author': {
-                    'username': tweet['author']['username'],
-                    'name': tweet['author']['name'],
-                    'followers_count': tweet['author'].get('followers_count', 0)
-                },
-                'engagement': {
-                    'likes': tweet.get('like_count', 0),
-                    'retweets': tweet.get('retweet_count', 0),
-                    'replies': tweet.get('reply_count', 0)
-                },
-                'mentions': tweet.get('mentions', []),
-                'hashtags': tweet.get('hashtags', []),
-                'urls': tweet.get('urls', []),
-                'processed_at': datetime.utcnow()
-            }
-
-            # Add sentiment analysis
-            tweet_data['sentiment'] = self._analyze_sentiment(tweet['text'])
+    def _store_tweets(self, tweets: List[Dict[str, Any]]) -> None:
+        """Store processed tweets, in one bulk insert where the handler supports it."""
+        if hasattr(self.db_handler, 'store_tweets'):
+            self.db_handler.store_tweets(tweets)
+        else:
+            for tweet in tweets:
+                self.db_handler.store_tweet(tweet)
+                logger.debug(f"Stored tweet {tweet['tweet_id']}")
+        logger.info(f"Stored {len(tweets)} tweets")
 
-            # Identify memecoin mentions
-            tweet_data['memecoin_mentions'] = self._identify_memecoins(tweet['text'])
+    def _process_chunks(self) -> Generator[List[Dict[str, Any]], None, None]:
+        """Process dataset chunks in a process pool, yielding results in order."""
+        # Bound the chunks in flight so the dataset is never fully in memory
+        max_pending = 2 * (self.workers or os.cpu_count() or 1)
+        with ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_worker,
+            initargs=(self.memecoin_patterns,)
+        ) as executor:
+            pending = deque()
+            for chunk in pd.read_json(self.dataset_path, lines=True, chunksize=self.batch_size):
+                pending.append(executor.submit(_process_chunk, chunk))
+                if len(pending) >= max_pending:
+                    yield pending.popleft().result()
 
-            return tweet_data
-        except Exception as e:
-            logger.error(f"Error processing tweet {tweet.get('id')}: {e}")
-            return None
+            while pending:
+                yield pending.popleft().result()
 
-    def _analyze_sentiment(self, text: str) -> Dict[str, float]:
-        """Analyze sentiment of tweet text using TextBlob."""
-        try:
-            analysis = TextBlob(text)
-            # Get polarity (-1 to 1) and convert to positive/negative/neutral
-            polarity = analysis.sentiment.polarity
-            
-            if polarity > 0.1:
-                return {'positive': 1.0, 'negative': 0.0, 'neutral': 0.0}
-            elif polarity < -0.1:
-                return {'positive': 0.0, 'negative': 1.0, 'neutral': 0.0}
-            else:
-                return {'positive': 0.0, 'negative': 0.0, 'neutral': 1.0}
-        except Exception as e:
-            logger.error(f"Error analyzing sentiment: {e}")
-            return {'positive': 0.0, 'negative': 0.0, 'neutral': 1.0}
-
-    def _identify_memecoins(self, text: str) -> List[str]:
-        """Identify memecoin mentions in tweet text."""
-        try:
-            found_memecoins = []
-            for pattern in self.memecoin_patterns:
-                matches = re.finditer(pattern, text, re.IGNORECASE)
-                for match in matches:
-                    found_memecoins.append(match.group())
-            return list(set(found_memecoins))  # Remove duplicates
-        except Exception as e:
-            logger.error(f"Error identifying memecoins: {e}")
-            return []
+    def _writer_loop(self, write_queue: queue.Queue, errors: List[Exception]) -> None:
+        """Store batches from the write queue until a None sentinel arrives."""
+        while True:
+            batch = write_queue.get()
+            if batch is None:
+                return
+            if errors:
+                # Keep draining after a failure so the producer never blocks
+                continue
+            try:
+                self._store_tweets(batch)
+            except Exception as e:
+                errors.append(e)
 
     def process_dataset(self) -> None:
         """Process the entire dataset in batches."""
         try:
             logger.info(f"Starting dataset processing from {self.dataset_path}")
             
-            # Read the dataset in chunks
-            for chunk in pd.read_json(self.dataset_path, lines=True, chunksize=self.batch_size):
-                for _, tweet in chunk.iterrows():
-                    # Convert tweet to dict and process
-                    tweet_dict = tweet.to_dict()
-                    processed_tweet = self._process_tweet(tweet_dict)
+            # Database writes run on a writer thread so they overlap with processing
+            write_queue = queue.Queue(maxsize=WRITE_QUEUE_SIZE)
+            errors = []
+            writer = threading.Thread(
+                target=self._writer_loop,
+                args=(write_queue, errors),
+                name='tweet-writer'
+            )
+            writer.start()
+            
+            try:
+                # Process chunks in worker processes and store in batches of batch_size
+                batch = []
+                for processed_tweets in self._process_chunks():
+                    if errors:
+                        break
+                    batch.extend(processed_tweets)
                     
-                    if processed_tweet:
-                        # Store in database
-                        self.db_handler.store_tweet(processed_tweet)
-                        logger.info(f"Processed tweet {processed_tweet['tweet_id']}")
+                    if len(batch) >= self.batch_size:
+                        write_queue.put(batch)
+                        batch = []
+                
+                if batch and not errors:
+                    write_queue.put(batch)
+            finally:
+                write_queue.put(None)
+                writer.join()
+            
+            if errors:
+                raise errors[0]
             
             logger.info("Dataset processing completed")
         except Exception as e:
             logger.error(f"Error processing dataset: {e}")
             raise
 
+    @staticmethod
+    def _parse_created_at(value: Any) -> Optional[datetime]:
+        """Parse an ISO timestamp, returning None if it is missing or invalid."""
+        try:
+            return datetime.fromisoformat(value.replace('Z', '+00:00'))
+        except (AttributeError, ValueError):
+            return None
+
     def get_dataset_stats(self) -> Dict[str, Any]:
-        """Get statistics about the dataset."""
+        """Get statistics about the dataset in a single streaming pass."""
         try:
-            df = pd.read_json(self.dataset_path, lines=True)
+            total_tweets = 0
+            start = end = None
+            usernames = set()
+            memecoin_mentions = 0
+
+            with open(self.dataset_path, 'rb') as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    tweet = orjson.loads(line)
+                    total_tweets += 1
+
+                    created_at = self._parse_created_at(tweet.get('created_at'))
+                    if created_at:
+                        if start is None or created_at < start:
+                            start = created_at
+                        if end is None or created_at > end:
+                            end = created_at
+
+                    author = tweet.get('author') or {}
+                    if author.get('username'):
+                        usernames.add(author['username'])
+
+                    if self._memecoin_re.search(tweet.get('text') or ''):
+                        memecoin_mentions += 1
+
             return {
-                'total_tweets': len(df),
+                'total_tweets': total_tweets,
                 'date_range': {
-                    'start': df['created_at'].min(),
-                    'end': df['created_at'].max()
+                    'start': start,
+                    'end': end
                 },
-                'unique_users': df['author.username'].nunique(),
-                'memecoin_mentions': sum(df['text'].str.contains('|'.join(self.memecoin_patterns), case=False))
+                'unique_users': len(usernames),
+                'memecoin_mentions': memecoin_mentions
             }
         except Exception as e:
             logger.error(f"Error getting dataset stats: {e}")